@@ -4,9 +4,12 @@
 Script that cycles through Ghostty themes to record demo videos.
 """
 
+import os
 import subprocess
+import tempfile
 import time
 from pathlib import Path
+from typing import TextIO
 
 import typer
 
@@ -36,46 +39,88 @@ GHOSTTY_CONFIG = Path.home() / '.config' / 'ghostty' / 'config'
 app = typer.Typer()
 
 
-def update_theme(theme_name: str) -> None:
-    """Update the Ghostty config file with the new theme."""
+def load_config() -> tuple[list[str], int]:
+    """
+    Read the Ghostty config once and locate the theme line.
+
+    Returns the config lines and the index of the theme line so theme
+    switches can mutate the cached lines instead of re-parsing the file
+    on every cycle.
+    """
     with open(GHOSTTY_CONFIG, 'r') as f:
         lines = f.readlines()
 
-    theme_line_found = False
     for i, line in enumerate(lines):
         if line.strip().startswith('theme ='):
-            lines[i] = f'theme = {theme_name}\n'
-            theme_line_found = True
-            break
+            return lines, i
 
-    if not theme_line_found:
-        raise ValueError(
-            'No theme config found in Ghostty config. Please add one first.'
-        )
+    raise ValueError(
+        'No theme config found in Ghostty config. Please add one first.'
+    )
 
-    with open(GHOSTTY_CONFIG, 'w') as f:
-        f.writelines(lines)
 
+def update_theme(
+    theme_name: str, lines: list[str], theme_line_idx: int
+) -> None:
+    """Update the cached config lines and write them atomically."""
+    lines[theme_line_idx] = f'theme = {theme_name}\n'
+
+    # Write to a tempfile and rename over the config. The rename is
+    # atomic, so Ghostty never sees a half-written config, and we skip
+    # fsync on purpose - losing a theme switch on power loss is fine.
+    with tempfile.NamedTemporaryFile(
+        'w', dir=GHOSTTY_CONFIG.parent, delete=False
+    ) as tmp:
+        # The tempfile is created 0600; carry over the config's mode
+        # so rewriting it never strips group/other permissions
+        try:
+            os.fchmod(tmp.fileno(), GHOSTTY_CONFIG.stat().st_mode)
+        except FileNotFoundError:
+            pass
+        tmp.writelines(lines)
+
+    os.replace(tmp.name, GHOSTTY_CONFIG)
+
+
+def start_osascript() -> subprocess.Popen[str]:
+    """
+    Start a persistent osascript interpreter.
 
-def reload_ghostty() -> None:
-    """Send cmd+shift+, to reload Ghostty config."""
-    apple_script = """
-    tell application "System Events"
-        keystroke "," using {command down, shift down}
-    end tell
+    Spawning `osascript -e ...` per theme costs tens of ms of process
+    startup each time. In interactive mode osascript executes one
+    statement per stdin line, so a single process can handle all
+    reloads.
     """
-    subprocess.run(['osascript', '-e', apple_script])
+    return subprocess.Popen(
+        ['osascript', '-i'],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        text=True,
+    )
 
 
-def set_terminal_title(title: str, tty_path: str) -> None:
-    """Set the title of a specific terminal window using its TTY path."""
+def reload_ghostty(osascript: subprocess.Popen[str]) -> None:
+    """Send cmd+shift+, to reload Ghostty config."""
+    apple_script = (
+        'tell application "System Events" to keystroke ","'
+        ' using {command down, shift down}\n'
+    )
+    assert osascript.stdin is not None
+    osascript.stdin.write(apple_script)
+    osascript.stdin.flush()
+
+
+def set_terminal_title(title: str, tty: TextIO) -> None:
+    """Set the title of a terminal window using its open TTY handle."""
     # The escape sequence to set window title is: ESC]0;titleBEL
     # Where ESC is \033 and BEL is \007
     title_sequence = f'\033]0;{title}\007'
 
     try:
-        with open(tty_path, 'w') as tty:
-            tty.write(title_sequence)
+        # One write + flush per title - the TTY stays open across
+        # cycles so we don't pay an open/close syscall pair per theme
+        tty.write(title_sequence)
+        tty.flush()
     except (IOError, PermissionError) as e:
         print(f'Failed to set terminal title: {e}')
 
@@ -111,16 +156,28 @@ def main(
         print(f'Waiting {delay} seconds before starting...')
         time.sleep(delay)
 
-    for theme in themes:
-        print(f'Switching to theme: {theme}')
-        if target_tty:
-            set_terminal_title(
-                f'Terminal Theme: {theme} | Bat Theme: vscode-light-modern',
-                target_tty,
-            )
-        update_theme(theme)
-        reload_ghostty()
-        time.sleep(sleep_duration)
+    lines, theme_line_idx = load_config()
+    osascript = start_osascript()
+    tty = open(target_tty, 'w') if target_tty else None
+
+    try:
+        for theme in themes:
+            print(f'Switching to theme: {theme}')
+            if tty is not None:
+                set_terminal_title(
+                    f'Terminal Theme: {theme} | '
+                    f'Bat Theme: vscode-light-modern',
+                    tty,
+                )
+            update_theme(theme, lines, theme_line_idx)
+            reload_ghostty(osascript)
+            time.sleep(sleep_duration)
+    finally:
+        if tty is not None:
+            tty.close()
+        if osascript.stdin is not None:
+            osascript.stdin.close()
+        osascript.wait()
 
 
 if __name__ == '__main__':
@@ -1,13 +1,17 @@
 import json
+import os
+import sys
+import tempfile
+from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import ClassVar, Iterator, Literal, Self, cast
+from typing import Any, Callable, ClassVar, Iterator, Literal, Self
 
-from pydantic import BaseModel, Field, field_serializer, field_validator
 from rich.color import Color
 from rich.style import Style
 
-from .terminal import get_terminal_ansi_color
+from .terminal import query_terminal_palette
 
 #
 # ANSI color definitions
@@ -68,6 +72,33 @@ AnsiColorNum = Literal[
 ]
 
 
+# Iteration orders derived once from the (immutable) enum; create()
+# resolves these to color instances without re-sorting
+_ORDER_BY_NUM: tuple[AnsiColorNum, ...] = tuple(
+    color.value for color in sorted(AnsiColorName, key=lambda c: c.value)
+)
+_ORDER_BY_NAME = tuple(sorted(AnsiColorName, key=lambda color: color.name))
+
+
+@lru_cache(maxsize=256)
+def _make_rich_style(
+    color: str | Color, bgcolor: str | None
+) -> Style | Literal['normal']:
+    """
+    Build (and cache) a rich style for a color / background pair.
+
+    Style construction parses and normalizes the color strings; render
+    loops request the same few pairs over and over, so caching them
+    skips that work after the first hit.
+    """
+    style: Style | Literal['normal'] = Style(color=color, bgcolor=bgcolor)
+
+    if style == Style():
+        style = 'normal'
+
+    return style
+
+
 class AnsiColor:
     """
     Represents an ANSI terminal color.
@@ -77,27 +108,45 @@ class AnsiColor:
     Colors are cached at class level to ensure single instance per color.
     """
 
+    # Slots: attribute access becomes a C-level slot load and the 18
+    # instances skip the per-instance __dict__
+    __slots__ = (
+        '_base_color',
+        '_rich_style',
+        'color_code',
+        'color_code_title',
+        'name',
+        'num',
+        'title',
+    )
+
     # Class-level storage
     _by_name: ClassVar[dict[AnsiColorName, 'AnsiColor']] = {}
     _by_num: ClassVar[dict[AnsiColorNum, 'AnsiColor']] = {}
-    _by_family: ClassVar[list['AnsiColor']] = []
+    _by_family: ClassVar[tuple['AnsiColor', ...]] = ()
+    _family_index: ClassVar[dict['AnsiColor', int]] = {}
+    _sorted_by_number: ClassVar[tuple['AnsiColor', ...]] = ()
+    _sorted_by_name: ClassVar[tuple['AnsiColor', ...]] = ()
     _initialized: ClassVar[bool] = False
 
-    def __init__(self, name: AnsiColorName) -> None:
+    # Derived values precomputed in create() so the corresponding
+    # properties don't rebuild them on every access
+    _base_color: 'AnsiColor'
+    _rich_style: Style | Literal['normal']
+
+    def __init__(self, name: AnsiColorName, color_code: str | None) -> None:
         """Initialize color (should only be called by create())."""
         self.name: str = name.name
         self.title: str = name.name.replace('_', ' ').title()
         self.num: AnsiColorNum = name.value
-        self.color_code: str | None = get_terminal_ansi_color(self.num)
-        self.color_code_title = (
-            self.color_code if self.color_code is not None else '' * 7
-        )
+        self.color_code: str | None = color_code
+        self.color_code_title = self.color_code or ''
 
     def __str__(self) -> str:
         """Return the color name."""
         return f'ANSI {self.num:02d}: {self.name}'
 
-    def get_color_code(self, if_none: str = '' * 7) -> str:
+    def get_color_code(self, if_none: str = '') -> str:
         """Get the color code, or a default if none."""
         return self.color_code or if_none
 
@@ -113,17 +162,12 @@ class AnsiColor:
             else:
                 color = Color.default()
 
-        style: Style | Literal['normal'] = Style(color=color, bgcolor=bgcolor)
-
-        if style == Style():
-            style = 'normal'
-
-        return style
+        return _make_rich_style(color, bgcolor)
 
     @property
     def rich_style(self) -> Style | Literal['normal']:
         """Return a rich style for this color."""
-        return self.get_rich_style()
+        return self._rich_style
 
     @property
     def is_bright(self) -> bool:
@@ -148,14 +192,12 @@ class AnsiColor:
     @property
     def base_color(self) -> 'AnsiColor':
         """Get the non-bright version of this color."""
-        if self.is_bright:
-            return self.from_num(cast(AnsiColorNum, self.num - 8))
-        return self
+        return self._base_color
 
     @property
     def sort_order_by_family(self) -> int:
         """Get index in family ordering."""
-        return self._by_family.index(self)
+        return self._family_index[self]
 
     #
     # Class methods
@@ -167,14 +209,18 @@ class AnsiColor:
         if cls._initialized:
             return
 
+        # Query all terminal colors in one batched raw-mode session
+        # instead of one termios round-trip per color
+        palette = query_terminal_palette()
+
         # Create all colors first
         for color_name in AnsiColorName:
-            color = cls(color_name)
+            color = cls(color_name, palette.get(color_name.value))
             cls._by_name[color_name] = color
             cls._by_num[color_name.value] = color
 
         # Build family order list
-        cls._by_family = [
+        by_family = [
             cls._by_num[AnsiColorName.BACKGROUND.value],
             cls._by_num[AnsiColorName.FOREGROUND.value],
         ]
@@ -187,58 +233,155 @@ class AnsiColor:
 
         for color_name in base_colors_names:
             # Normal color
-            cls._by_family.append(cls._by_num[color_name.value])
+            by_family.append(cls._by_num[color_name.value])
 
             # Bright variant
-            cls._by_family.append(
-                cls._by_num[cast(AnsiColorNum, color_name.value + 8)]
+            by_family.append(
+                # typing.cast is a real function call at runtime, so
+                # hint the index instead
+                cls._by_num[color_name.value + 8]  # type: ignore[index]
             )
 
+        cls._by_family = tuple(by_family)
+
+        # Index positions once so sort_order_by_family is a dict lookup
+        # instead of an O(n) list scan per access
+        cls._family_index = {
+            color: idx for idx, color in enumerate(cls._by_family)
+        }
+
+        # Resolve the precomputed iteration orders to instances once so
+        # the iterator classmethods don't sort or look up per call
+        cls._sorted_by_number = tuple(
+            cls._by_num[num] for num in _ORDER_BY_NUM
+        )
+        cls._sorted_by_name = tuple(
+            cls._by_name[color] for color in _ORDER_BY_NAME
+        )
+
+        # Precompute per-color derived values for the property accessors
+        for color in cls._by_name.values():
+            color._base_color = (
+                cls._by_num[color.num - 8]  # type: ignore[index]
+                if color.is_bright
+                else color
+            )
+            color._rich_style = color.get_rich_style()
+
         cls._initialized = True
 
     @classmethod
     def from_name(cls, name: AnsiColorName) -> 'AnsiColor':
         """Get a color by its name."""
+        if not cls._initialized:
+            cls.create()
 
-        if name not in AnsiColorName:
-            raise ValueError(f'Invalid color name: {name}')
-
-        return cls._by_name[name]
+        try:
+            return cls._by_name[name]
+        except KeyError as e:
+            raise ValueError(f'Invalid color name: {name}') from e
 
     @classmethod
     def from_num(cls, num: AnsiColorNum) -> 'AnsiColor':
         """Get a color by its number."""
-        if num < 0 or num > 15:
+        if not cls._initialized:
+            cls.create()
+
+        # Guard negatives explicitly: _by_num also holds the special
+        # background (-2) and foreground (-1) colors
+        if num < 0:
             raise ValueError(
                 f'ANSI color number must be between 0 and 15, got: {num}'
             )
 
-        return cls._by_num[num]
+        try:
+            return cls._by_num[num]
+        except KeyError as e:
+            raise ValueError(
+                f'ANSI color number must be between 0 and 15, got: {num}'
+            ) from e
 
     @classmethod
     def iter_by_number(cls) -> Iterator['AnsiColor']:
         """Iterate through all colors in numerical order (0-15)."""
-        return (
-            cls._by_num[color.value]
-            for color in sorted(AnsiColorName, key=lambda color: color.value)
-        )
+        if not cls._initialized:
+            cls.create()
+
+        return iter(cls._sorted_by_number)
 
     @classmethod
     def iter_by_name(cls) -> Iterator['AnsiColor']:
         """Iterate through all colors in alphabetical order."""
-        return (
-            cls._by_name[color]
-            for color in sorted(AnsiColorName, key=lambda color: color.name)
-        )
+        if not cls._initialized:
+            cls.create()
+
+        return iter(cls._sorted_by_name)
 
     @classmethod
     def iter_by_family(cls) -> Iterator['AnsiColor']:
         """Iterate through colors in family order."""
+        if not cls._initialized:
+            cls.create()
+
         return iter(cls._by_family)
 
 
-# Create all standard colors
-AnsiColor.create()
+#
+# ANSI color coercion helpers
+#
+
+
+# Name-to-color lookup table, filled on first use: serialized values
+# are already upper-case enum names, so the common case resolves with a
+# single dict probe and no str.upper() allocation. Built lazily so
+# importing the module never triggers AnsiColor.create() (and with it
+# the terminal palette query).
+_NAME_TO_ANSI: dict[str, AnsiColor] = {}
+
+
+def _ansi_color_from_str(value: str) -> AnsiColor:
+    """Convert a color name or number string to an AnsiColor."""
+    if not _NAME_TO_ANSI:
+        _NAME_TO_ANSI.update(
+            (name.name, AnsiColor.from_name(name)) for name in AnsiColorName
+        )
+
+    # Try the name directly first, then upper-cased
+    color = _NAME_TO_ANSI.get(value) or _NAME_TO_ANSI.get(value.upper())
+    if color is not None:
+        return color
+
+    # If not a name, try converting to int
+    try:
+        num = int(value)
+    except ValueError as e:
+        raise ValueError(f'Invalid ANSI color name or number: {value}') from e
+
+    return AnsiColor.from_num(num)  # type: ignore
+
+
+def _ansi_color_from_int(value: int) -> AnsiColor:
+    """Convert an ANSI color number to an AnsiColor."""
+    return AnsiColor.from_num(value)  # type: ignore
+
+
+# Dispatch table for coercing `ColorMapping.ansi_color` values: a
+# single type lookup replaces an isinstance chain per loaded mapping
+_ANSI_COLOR_HANDLERS: dict[type, Callable[[Any], AnsiColor | None]] = {
+    AnsiColor: lambda value: value,
+    str: _ansi_color_from_str,
+    int: _ansi_color_from_int,
+    type(None): lambda value: None,
+}
+
+
+def coerce_ansi_color(value: AnsiColor | str | int | None) -> AnsiColor | None:
+    """Coerce a color name, number or AnsiColor to an AnsiColor."""
+    handler = _ANSI_COLOR_HANDLERS.get(type(value))
+    if handler is None:
+        raise ValueError(f'Invalid ANSI color value: {value}')
+
+    return handler(value)
 
 
 #
@@ -246,96 +389,114 @@ AnsiColor.create()
 #
 
 
-class ColorMapping(BaseModel):
-    """Maps a color to ANSI and tracks its usage."""
+@dataclass(slots=True)
+class ColorMapping:
+    """
+    Maps a color to ANSI and tracks its usage.
 
-    class Config:
-        arbitrary_types_allowed = True
+    A plain slotted dataclass rather than a pydantic model: one instance
+    is created per color in a theme, and skipping per-field validation
+    machinery keeps bulk loading cheap. JSON coercion happens once in
+    `from_json` instead.
+    """
 
     color_code: str
     ansi_color: AnsiColor | None = None
-    ui_settings: set[str] = Field(default_factory=set)
-    scopes: set[str] = Field(default_factory=set)
-
-    @field_serializer('ui_settings', 'scopes')
-    def serialize_sets(self, value: set[str]) -> list[str]:
-        """Convert sets to sorted lists for JSON serialization."""
-        return sorted(value)
+    ui_settings: tuple[str, ...] = ()
+    scopes: tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        """Coerce ansi_color and normalize the usage collections."""
+        self.ansi_color = coerce_ansi_color(self.ansi_color)
+
+        # Store usages as sorted, deduplicated, interned tuples.
+        # Mapping data is write-once read-many, so paying one sort here
+        # is cheaper than set hashing on every access and a sort on
+        # every serialize. Interning collapses the heavily repeated
+        # scope strings to one object each, so later set merges and
+        # dict probes compare by pointer before falling back to a full
+        # string compare.
+        self.ui_settings = tuple(
+            sorted(set(map(sys.intern, self.ui_settings)))
+        )
+        self.scopes = tuple(sorted(set(map(sys.intern, self.scopes))))
 
-    @field_validator('ui_settings', 'scopes', mode='before')
     @classmethod
-    def validate_sets(cls, value: list[str] | set[str]) -> set[str]:
-        """Convert lists to sets when loading from JSON."""
-        if isinstance(value, list):
-            return set(value)
-        return value
+    def from_json(cls, data: dict[str, Any]) -> 'ColorMapping':
+        """Create a mapping from its JSON dict representation."""
+        return cls(
+            color_code=data['color_code'],
+            ansi_color=data.get('ansi_color'),
+            ui_settings=tuple(data.get('ui_settings', ())),
+            scopes=tuple(data.get('scopes', ())),
+        )
 
-    @field_validator('ansi_color', mode='before')
-    @classmethod
-    def validate_ansi_color(
-        cls, value: AnsiColor | str | int | None
-    ) -> AnsiColor | None:
-        """Convert string or int to AnsiColor object."""
-        if value is None:
-            return None
-
-        # Handle AnsiColor object
-        if isinstance(value, AnsiColor):
-            return value
-
-        # Handle string input (color name)
-        if isinstance(value, str):
-            try:
-                # Try to get enum by name
-                color_name = AnsiColorName[value.upper()]
-                return AnsiColor.from_name(color_name)
-            except KeyError as e:
-                # If not a name, try converting to int
-                try:
-                    num = int(value)
-                    return AnsiColor.from_num(num)  # type: ignore
-                except ValueError:
-                    raise ValueError(
-                        f'Invalid ANSI color name or number: {value}'
-                    ) from e
-
-        # Handle integer input
-        if isinstance(value, int):
-            return AnsiColor.from_num(value)  # type: ignore
+    def to_json(self) -> dict[str, Any]:
+        """Convert the mapping to a JSON-serializable dict."""
+        ansi_color = self.ansi_color
 
-        raise ValueError(f'Invalid ANSI color value: {value}')
+        return {
+            'color_code': self.color_code,
+            'ansi_color': ansi_color.name if ansi_color else None,
+            'ui_settings': list(self.ui_settings),
+            'scopes': list(self.scopes),
+        }
 
     @property
     def usage_count(self) -> int:
         """Total number of places this color is used."""
         return len(self.ui_settings) + len(self.scopes)
 
-    @field_serializer('ansi_color')
-    def serialize_ansi_color(self, ansi_color: AnsiColor | None) -> str | None:
-        """Serialize AnsiColor to string."""
-        if ansi_color is None:
-            return None
-        return ansi_color.name
-
 
-class AnsiMapping(BaseModel):
+@dataclass
+class AnsiMapping:
     """Collection of color mappings for a theme."""
 
     theme_name: str
     color_mappings: list[ColorMapping]
 
+    # Lazily built cache for token_color_mappings; reset whenever
+    # color_mappings is mutated
+    _token_color_mappings: dict[str, ColorMapping] | None = field(
+        default=None, init=False, repr=False
+    )
+
     def save_json(self, file_path: Path | str) -> None:
         """Save the color mappings to a JSON file."""
         if isinstance(file_path, str):
             file_path = Path(file_path)
 
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(
-                self.model_dump(mode='json'),
-                f,
-                indent=2,
-                ensure_ascii=False,
-            )
+        json_str = json.dumps(
+            {
+                'theme_name': self.theme_name,
+                'color_mappings': [
+                    mapping.to_json() for mapping in self.color_mappings
+                ],
+            },
+            indent=2,
+            ensure_ascii=False,
+        )
+
+        # Write to a tempfile and rename it over the destination: the
+        # rename is atomic, so a crash mid-write can never leave a
+        # truncated mapping file behind. No fsync - mapping files are
+        # regenerable, so crash-durability is not worth the cost.
+        with tempfile.NamedTemporaryFile(
+            'w',
+            dir=file_path.parent,
+            delete=False,
+            encoding='utf-8',
+        ) as tmp:
+            # The tempfile is created 0600; carry over the mode of an
+            # existing destination so re-saving never strips
+            # group/other permissions the user has set
+            try:
+                os.fchmod(tmp.fileno(), file_path.stat().st_mode)
+            except FileNotFoundError:
+                pass
+            tmp.write(json_str)
+
+        os.replace(tmp.name, file_path)
 
     @classmethod
     def load_json(cls, file_path: Path | str) -> Self:
@@ -345,12 +506,24 @@ class AnsiMapping(BaseModel):
 
         with open(file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
-            return cls.model_validate(data)
+
+        return cls(
+            theme_name=data['theme_name'],
+            color_mappings=[
+                ColorMapping.from_json(mapping)
+                for mapping in data['color_mappings']
+            ],
+        )
 
     @property
     def token_color_mappings(self) -> dict[str, ColorMapping]:
         """Get mappings as a dict for backward compatibility."""
-        return {mapping.color_code: mapping for mapping in self.color_mappings}
+        if self._token_color_mappings is None:
+            self._token_color_mappings = {
+                mapping.color_code: mapping for mapping in self.color_mappings
+            }
+
+        return self._token_color_mappings
 
     def update_from_mapping(self, update_mapping: 'AnsiMapping') -> None:
         """
@@ -387,7 +560,10 @@ class AnsiMapping(BaseModel):
                     ColorMapping(
                         color_code=update_color.color_code,
                         ansi_color=update_color.ansi_color,
-                        ui_settings=set(),
-                        scopes=set(),
+                        ui_settings=(),
+                        scopes=(),
                     )
                 )
+
+        # Invalidate the cached dict view
+        self._token_color_mappings = None
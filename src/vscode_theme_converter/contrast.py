@@ -2,6 +2,9 @@
 Helpers to calculate WCAG contrast ratio.
 """
 
+from bisect import bisect_right
+from functools import lru_cache
+
 
 def get_contrast_ratio(fg: str, bg: str) -> float:
     """
@@ -9,42 +12,79 @@ def get_contrast_ratio(fg: str, bg: str) -> float:
 
     This is what Google Chrome shows in the developer tools.
     """
-    fg_rgb = get_rgb(fg)
-    bg_rgb = get_rgb(bg)
+    return get_contrast_ratio_from_luminance(
+        get_hex_luminance(fg),
+        get_hex_luminance(bg),
+    )
 
-    fg_lum = get_luminance(*fg_rgb)
-    bg_lum = get_luminance(*bg_rgb)
 
+def get_contrast_ratio_from_luminance(fg_lum: float, bg_lum: float) -> float:
+    """Calculate contrast ratio from two precomputed luminances."""
     lighter = max(fg_lum, bg_lum)
     darker = min(fg_lum, bg_lum)
 
     return (lighter + 0.05) / (darker + 0.05)
 
 
+@lru_cache(maxsize=1024)
+def get_hex_luminance(hex_color: str) -> float:
+    """
+    Get the relative luminance of a hex color.
+
+    Cached because themes reuse the same hex codes across many scopes,
+    so repeated colors skip the parse and linearization entirely.
+    """
+    return get_luminance(*get_rgb(hex_color))
+
+
+def get_contrast_ratios(fg_colors: list[str], bg_color: str) -> list[float]:
+    """
+    Calculate contrast ratios of many foreground colors against one
+    background.
+
+    The background luminance is computed only once instead of once per
+    pair, which is what makes this faster than calling
+    `get_contrast_ratio` in a loop.
+    """
+    bg_lum = get_hex_luminance(bg_color)
+
+    return [
+        get_contrast_ratio_from_luminance(get_hex_luminance(fg), bg_lum)
+        for fg in fg_colors
+    ]
+
+
+# WCAG rating thresholds and their labels: a ratio rounded to one
+# decimal is binary-searched into the thresholds instead of walking an
+# if/elif chain
+_RATING_THRESHOLDS = (4.5, 7.0)
+_RATING_LABELS = ('✗', 'AA', 'AAA')
+
+
 def get_contrast_ratio_rating(ratio: float) -> str:
     """Get the WCAG rating for a contrast ratio."""
-
-    if round(ratio, 1) >= 7.0:
-        return 'AAA'
-    elif round(ratio, 1) >= 4.5:
-        return 'AA'
-    else:
-        return '✗'
+    return _RATING_LABELS[bisect_right(_RATING_THRESHOLDS, round(ratio, 1))]
 
 
-def get_rgb(hex_color: str) -> tuple[float, float, float]:
-    """Convert hex color to RGB values between 0 and 1."""
-    hex_color = hex_color.lstrip('#')
-    r = int(hex_color[0:2], 16) / 255.0
-    g = int(hex_color[2:4], 16) / 255.0
-    b = int(hex_color[4:6], 16) / 255.0
-    return (r, g, b)
+def get_rgb(hex_color: str) -> tuple[int, int, int]:
+    """Convert hex color to 8-bit RGB values between 0 and 255."""
+    # One C-level hex decode instead of three sliced int(..., 16) calls
+    raw = bytes.fromhex(hex_color.removeprefix('#'))
+    return (raw[0], raw[1], raw[2])
 
 
-def get_luminance(r: float, g: float, b: float) -> float:
-    """Calculate relative luminance."""
+def get_luminance(r: int, g: int, b: int) -> float:
+    """Calculate relative luminance from 8-bit RGB values."""
+    return (
+        0.2126 * _SRGB_LUT[r] + 0.7152 * _SRGB_LUT[g] + 0.0722 * _SRGB_LUT[b]
+    )
 
-    def adjust(c: float) -> float:
-        return c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4
 
-    return 0.2126 * adjust(r) + 0.7152 * adjust(g) + 0.0722 * adjust(b)
+# sRGB -> linear conversion table. Channels always come from 8-bit hex
+# colors, so there are only 256 possible inputs - precomputing them
+# replaces the expensive ** 2.4 in the piecewise sRGB curve with an
+# index into this table.
+_SRGB_LUT = tuple(
+    c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4
+    for c in (n / 255.0 for n in range(256))
+)
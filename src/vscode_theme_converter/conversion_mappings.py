@@ -49,3 +49,7 @@ VSCODE_TO_TM_SETTINGS_MAP = {
     for key, value in TM_TO_VSCODE_SETTINGS_MAP.items()
     if value is not None
 }
+
+# Frozen key set for membership tests in per-color loops: O(1) hash
+# probe instead of scanning a list of keys
+VSCODE_TO_TM_SETTINGS_KEYS = frozenset(VSCODE_TO_TM_SETTINGS_MAP)
@@ -12,7 +12,23 @@ from vscode_theme_converter.tm_theme import (
     TMThemeTokenRule,
     TMThemeTokenRuleSettings,
 )
-from vscode_theme_converter.vscode_theme import VSCodeTheme
+from vscode_theme_converter.vscode_theme import TokenColor, VSCodeTheme
+
+
+def _token_to_rule(token: TokenColor) -> TMThemeTokenRule:
+    """Build a TM token rule from a single VSCode token rule."""
+    # Bind the settings object once: the attribute chain
+    # token.settings.foreground would otherwise repeat the first
+    # lookup for every field
+    settings = token.settings
+    return TMThemeTokenRule.model_construct(
+        name=token.name,
+        scope=token.scope,
+        settings=TMThemeTokenRuleSettings.model_construct(
+            foreground=settings.foreground,
+            font_style=settings.font_style,
+        ),
+    )
 
 
 def convert_vscode_theme_to_tm_theme(
@@ -20,29 +36,27 @@ def convert_vscode_theme_to_tm_theme(
 ) -> TMTheme:
     """Convert VSCode theme to TextMate theme format."""
 
-    # Create global settings by mapping VSCode colors to TM settings
-    global_settings_dict: dict[str, str] = {}
-    for vscode_key, color in vscode_theme.colors.items():
-        if vscode_key in VSCODE_TO_TM_SETTINGS_MAP:
-            tm_key = VSCODE_TO_TM_SETTINGS_MAP[vscode_key]
-            global_settings_dict[tm_key] = color
-    global_settings_item = TMThemeGlobalSettings(settings=global_settings_dict)
-
-    settings: list[TMThemeSettingsItem] = [global_settings_item]
-
-    for token in vscode_theme.token_colors:
-        settings.append(
-            TMThemeTokenRule(
-                name=token.name,
-                scope=token.scope,
-                settings=TMThemeTokenRuleSettings(
-                    foreground=token.settings.foreground,
-                    fontStyle=token.settings.font_style,
-                ),
-            )
-        )
-
-    return TMTheme(
+    # Create global settings by mapping VSCode colors to TM settings.
+    # Iterate the mapping in definition order with one C-level dict
+    # probe per key: the resulting settings order is deterministic, so
+    # regenerating a theme never produces spurious byte diffs.
+    theme_colors = vscode_theme.colors
+    global_settings_dict: dict[str, str] = {
+        tm_key: theme_colors[vscode_key]
+        for vscode_key, tm_key in VSCODE_TO_TM_SETTINGS_MAP.items()
+        if vscode_key in theme_colors
+    }
+
+    # The source values are already validated theme data, so the TM
+    # models are assembled with model_construct - no pydantic
+    # validation dispatch per rule. map() drives the per-token helper
+    # entirely from C, with no generator frame to resume per rule.
+    settings: list[TMThemeSettingsItem] = [
+        TMThemeGlobalSettings.model_construct(settings=global_settings_dict)
+    ]
+    settings.extend(map(_token_to_rule, vscode_theme.token_colors))
+
+    return TMTheme.model_construct(
         name=vscode_theme.name or 'Converted Theme',
         settings=settings,
     )
@@ -1,16 +1,18 @@
+from functools import lru_cache
 from pathlib import Path
 
 import typer
-from rich import print as rprint
+from rich.console import Console
 from rich.style import Style
+from rich.text import Text
 
-from .ansi_mapping import AnsiColor, AnsiMapping, ColorMapping
-from .contrast import get_contrast_ratio, get_contrast_ratio_rating
-from .converter_vsc_tm import convert_vscode_theme_to_tm_theme
-from .terminal import (
-    get_terminal_background_color,
-)
-from .vscode_theme import VSCodeTheme
+# The package's own modules are imported inside the commands that need
+# them: they pull in pydantic and friends, which short-lived
+# invocations like --help never need.
+
+# Single shared console: every output line reuses one configured
+# instance instead of going through rich's global print wrapper
+console = Console()
 
 app = typer.Typer(
     help=(
@@ -41,6 +43,10 @@ def convert(
     ),
 ) -> None:
     """Convert a VSCode theme to TextMate format."""
+    from .ansi_mapping import AnsiMapping
+    from .converter_vsc_tm import convert_vscode_theme_to_tm_theme
+    from .vscode_theme import VSCodeTheme
+
     # Load theme
     theme = VSCodeTheme.from_json(input_file)
 
@@ -68,12 +74,18 @@ def ansi_map_gen(
     ),
 ) -> None:
     """Generate initial ANSI color mappings from a VSCode theme."""
-    # Generate new mapping
-    theme = VSCodeTheme.from_json(input_file)
+    from .ansi_mapping import AnsiMapping
+    from .vscode_theme import VSCodeTheme
+
+    # Generate new mapping (partial load: the mapping only needs the
+    # name, colors and token rules)
+    theme = VSCodeTheme.from_json_partial(input_file)
     new_mapping = theme.generate_ansi_mapping()
 
-    # Update with existing mapping if it exists
-    if output_file.exists():
+    # Update with existing mapping if it exists (stat once and reuse
+    # the answer: save_json below would make a second check lie)
+    file_existed = output_file.exists()
+    if file_existed:
         should_update = typer.confirm(
             f'\nFile {output_file} already exists. '
             f'Update with existing mappings?',
@@ -90,7 +102,7 @@ def ansi_map_gen(
     # Save the mapping
     new_mapping.save_json(output_file)
     typer.echo(
-        f'{"Updated" if output_file.exists() else "Generated"} '
+        f'{"Updated" if file_existed else "Generated"} '
         f'ANSI color mapping in {output_file}\n'
         'Edit this file to customize the color assignments.'
     )
@@ -107,40 +119,56 @@ def ansi_map_show(
     ),
 ) -> None:
     """Display all colors and their ANSI mappings."""
+    from .ansi_mapping import AnsiMapping
+
     # Load mapping
     mapping = AnsiMapping.load_json(mapping_file)
 
     # Print header
     typer.echo(f'\nToken color mappings for theme: {mapping.theme_name}\n')
 
-    def sort_key(item: tuple[str, ColorMapping]) -> tuple[int, str]:
-        """Sort by color family order, with unmapped last."""
-        _, color_map = item
-        if color_map.ansi_color is None:
-            return (999, '')  # Unmapped colors go last
-        return (color_map.ansi_color.sort_order_by_family, '')
+    # Sort by color family order, with unmapped last. The keys are
+    # extracted up front so the sort compares plain tuples instead of
+    # dispatching into a key callable per entry.
+    # The original position breaks ties so the sort stays stable without
+    # ever comparing the mapping objects themselves.
+    keyed = [
+        (
+            item[1].ansi_color.sort_order_by_family
+            if item[1].ansi_color is not None
+            else 999,  # Unmapped colors go last
+            pos,
+            item,
+        )
+        for pos, item in enumerate(mapping.token_color_mappings.items())
+    ]
+    keyed.sort()
 
     # Print each color's info
-    for idx, (color_code, color_map) in enumerate(
-        sorted(mapping.token_color_mappings.items(), key=sort_key), start=1
-    ):
+    for idx, (_, _, (color_code, color_map)) in enumerate(keyed, start=1):
         # Create styles
-        hex_style = Style(color=color_code)
+        hex_style = get_hex_style(color_code)
 
         if color_map.ansi_color is not None:
             ansi_color = color_map.ansi_color
-            ansi_text = (
-                f'[{ansi_color.rich_style}]'
-                f'{ansi_color.get_color_code("")} {ansi_color.title}[/]'
+            ansi_part = (
+                f'{ansi_color.get_color_code("")} {ansi_color.title}',
+                ansi_color.rich_style,
             )
         else:
-            ansi_text = 'Unmapped'
-
-        # Print with color and index
-        rprint(
-            f'[{idx:2d}] ',
-            f'[{hex_style}]■■■■ Abcd {color_code:<8}[/]',
-            f' → {ansi_text:<15} (Used in {color_map.usage_count} scopes)',
+            ansi_part = ('Unmapped', 'default')
+
+        # Assemble the line as a Text object: styles are applied
+        # directly, so rich's markup parser never runs on the hot
+        # display loop
+        console.print(
+            Text.assemble(
+                f'[{idx:2d}]  ',
+                (f'■■■■ Abcd {color_code:<8}', hex_style),
+                '  → ',
+                ansi_part,
+                f'  (Used in {color_map.usage_count} scopes)',
+            )
         )
 
         if not quiet:
@@ -160,6 +188,9 @@ def ansi_map_show(
 @app.command()
 def print_terminal_colors() -> None:
     """Show how the current terminal colors look."""
+    from .ansi_mapping import AnsiColor
+    from .contrast import get_contrast_ratio, get_contrast_ratio_rating
+    from .terminal import get_terminal_background_color
 
     def print_color(
         color_code: str | None,
@@ -182,7 +213,7 @@ def print_terminal_colors() -> None:
             color_code = 'Unknown'
 
         # Print the color info
-        rprint(
+        console.print(
             f'    [on {style}]    [/]  ',
             f'[{style}]{color_code}[/]',
             f'  {title:<12}{contrast_info}',
@@ -219,30 +250,52 @@ def check_contrast(
     """
     Check contrast ratio between background and multiple foreground colors.
     """
+    from .contrast import (
+        get_contrast_ratio_rating,
+        get_contrast_ratios,
+        get_hex_luminance,
+    )
 
     try:
         bg_style = get_color_style(None, background_color)
-        rprint(f'Background: {background_color} [{bg_style}]■■■■[/]\n')
+        console.print(f'Background: {background_color} [{bg_style}]■■■■[/]\n')
     except Exception as e:
-        rprint(f'[red]Error:[/] {e}')
+        console.print(f'[red]Error:[/] {e}')
         return
 
-    rprint('Foreground Colors:')
+    # Compute the background luminance once instead of per color
+    try:
+        bg_lum = get_hex_luminance(background_color)
+    except (ValueError, IndexError):
+        bg_lum = None
+
+    # Rate all parseable colors in one batch before printing
+    ratios: dict[str, float] = {}
+    if bg_lum is not None:
+        parseable = []
+        for color in foreground_colors:
+            try:
+                get_hex_luminance(color)
+                parseable.append(color)
+            except (ValueError, IndexError):
+                continue
+
+        ratios = dict(
+            zip(parseable, get_contrast_ratios(parseable, background_color))
+        )
+
+    console.print('Foreground Colors:')
     for color in foreground_colors:
         try:
             fg_style = get_color_style(color, background_color)
         except Exception as e:
-            rprint(f'\t{color} is invalid: {e}')
+            console.print(f'\t{color} is invalid: {e}')
             continue
 
-        try:
-            ratio = get_contrast_ratio(color, background_color)
-            rating = get_contrast_ratio_rating(ratio)
-        except Exception:
-            ratio = -1
-            rating = '(N/A)'
+        ratio = ratios.get(color, -1)
+        rating = get_contrast_ratio_rating(ratio) if ratio >= 0 else '(N/A)'
 
-        rprint(
+        console.print(
             f'\t[{fg_style}]{color:<8} ■■■■[/]',
             f' → {ratio:4.1f} ({rating})',
         )
@@ -253,6 +306,18 @@ def check_contrast(
 #
 
 
+@lru_cache(maxsize=512)
+def get_hex_style(color_code: str) -> Style:
+    """
+    Get a rich Style for a hex color.
+
+    Cached because Style construction parses and normalizes the color
+    string, and themes reuse the same hex codes across many entries.
+    """
+    return Style(color=color_code)
+
+
+@lru_cache(maxsize=512)
 def get_color_style(color: str | None, bg_color: str | None) -> Style:
     """Get a Rich Style object for a color."""
 
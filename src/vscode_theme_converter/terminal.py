@@ -3,19 +3,246 @@ Functions that help us to determine the actual colors the current terminal is
 using.
 """
 
+import hashlib
+import json
+import os
+import re
 import select
 import sys
+import tempfile
 import termios
-import tty
-from functools import lru_cache
+import time
+from functools import cache, lru_cache
+from pathlib import Path
 
 DEBUG = False
 TIMEOUT_RESPONSE = 0.2
 TIMEOUT_READ_CHAR = 0.05
 RETRIES = 2
 
+# Maximum bytes we accept for a batched palette response before
+# assuming the terminal is misbehaving
+MAX_RESPONSE_LEN = 8192
+
+# On-disk cache for queried palettes, so warm CLI runs can skip the
+# OSC round-trips. The cache key (TERM / TTY) does not change when the
+# user switches terminal themes, so entries expire after a short TTL -
+# that bounds how long a theme switch can go unnoticed. Set
+# VSCODE_THEME_CONVERTER_NO_CACHE to bypass the disk cache entirely
+# (e.g. while cycling themes).
+PALETTE_CACHE_DIR = Path.home() / '.cache' / 'vscode_theme_converter'
+PALETTE_CACHE_TTL = 60.0
+
+# Responses report colors as 1-4 hex digits per channel (xterm spec);
+# a single precompiled regex match replaces a chain of split calls and
+# their intermediate strings
+_RGB_RE = re.compile(
+    rb'rgb:([0-9a-f]{1,4})/([0-9a-f]{1,4})/([0-9a-f]{1,4})', re.IGNORECASE
+)
+
+# Batched-response demultiplexer: matches the echoed OSC 4 color number
+# or the OSC 10/11 code along with the color in one pass
+_PALETTE_RE = re.compile(
+    rb'\](?:4;(-?\d+)|(1[01]));'
+    rb'rgb:([0-9a-f]{1,4})/([0-9a-f]{1,4})/([0-9a-f]{1,4})',
+    re.IGNORECASE,
+)
+
+
+def _terminal_usable() -> bool:
+    """
+    Whether the terminal can answer OSC queries at all.
+
+    When output is piped, the query bytes would pollute downstream
+    output, and a dumb terminal never answers - both cases would only
+    burn the full timeout per query. A function (not a module constant)
+    so tests can monkeypatch the streams.
+    """
+    try:
+        return (
+            sys.stdin.isatty()
+            and sys.stdout.isatty()
+            and os.environ.get('TERM', '') not in ('', 'dumb')
+        )
+    except (OSError, ValueError):
+        return False
+
+
+def _palette_cache_enabled() -> bool:
+    """Whether the on-disk palette cache may be read or written."""
+    return not os.environ.get('VSCODE_THEME_CONVERTER_NO_CACHE')
+
+
+def _palette_cache_path() -> Path | None:
+    """
+    Get the palette cache file for the current terminal.
+
+    The cache is keyed on the TTY device and the terminal-identifying
+    environment variables, so different terminals (or palette-changing
+    env setups) get separate entries. Returns None when stdin is not a
+    TTY, in which case there is no palette to cache.
+    """
+    try:
+        if not sys.stdin.isatty():
+            return None
+        tty_name = os.ttyname(sys.stdin.fileno())
+    except OSError:
+        return None
+
+    key = '|'.join(
+        (
+            os.environ.get('TERM', ''),
+            os.environ.get('TERM_PROGRAM', ''),
+            os.environ.get('COLORFGBG', ''),
+            tty_name,
+        )
+    )
+    digest = hashlib.blake2s(key.encode()).hexdigest()[:16]
+
+    return PALETTE_CACHE_DIR / f'palette-{digest}.json'
+
+
+def _load_palette_cache(debug: bool = DEBUG) -> dict[int, str | None] | None:
+    """Load a previously queried palette for this terminal, if any."""
+    if not _palette_cache_enabled():
+        return None
+
+    cache_path = _palette_cache_path()
+    if cache_path is None:
+        return None
+
+    try:
+        if time.time() - cache_path.stat().st_mtime > PALETTE_CACHE_TTL:
+            _debug_print('Palette cache expired', debug)
+            return None
+        data = json.loads(cache_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(data, dict):
+        return None
+
+    # Validate entries: a stale or corrupted cache must never poison
+    # the palette with non-hex values
+    palette: dict[int, str | None] = {}
+    for num_str, color in data.items():
+        try:
+            num = int(num_str)
+        except ValueError:
+            return None
+
+        if color is not None and not (
+            isinstance(color, str)
+            and len(color) == 7
+            and color.startswith('#')
+        ):
+            return None
+
+        palette[num] = color
+
+    _debug_print(f'Loaded palette cache from {cache_path}', debug)
+    return palette
+
+
+def _save_palette_cache(
+    palette: dict[int, str | None], debug: bool = DEBUG
+) -> None:
+    """Persist a queried palette for future runs (best effort)."""
+    if not _palette_cache_enabled():
+        return
+
+    cache_path = _palette_cache_path()
+    if cache_path is None:
+        return
+
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to a tempfile and rename so concurrent runs never see
+        # a partially written cache
+        with tempfile.NamedTemporaryFile(
+            'w',
+            dir=cache_path.parent,
+            delete=False,
+            encoding='utf-8',
+        ) as tmp:
+            json.dump({str(num): c for num, c in palette.items()}, tmp)
+
+        os.replace(tmp.name, cache_path)
+    except OSError as e:
+        _debug_print(f'Failed to save palette cache: {e}', debug)
+        return
 
-@lru_cache(maxsize=16)
+    _debug_print(f'Saved palette cache to {cache_path}', debug)
+
+
+def query_terminal_palette(debug: bool = DEBUG) -> dict[int, str | None]:
+    """
+    Query all terminal colors in a single raw-mode session.
+
+    Querying each color separately pays a full termios save / raw /
+    restore cycle plus one terminal round-trip per color. This sends
+    all queries back-to-back in one session (16x OSC 4, the OSC 10/11
+    foreground / background queries and their OSC 4;-1/-2 fallbacks)
+    and demultiplexes the concatenated responses.
+
+    Returns:
+        Dict of ANSI color number (-2 and -1 for the special
+        background / foreground colors) to hex color, with None for
+        colors the terminal did not report.
+    """
+    if not _terminal_usable():
+        _debug_print('Terminal not usable, skipping palette query', debug)
+        return {}
+
+    cached = _load_palette_cache(debug=debug)
+    if cached is not None:
+        return cached
+
+    queries = [b'\033]4;%d;?\033\\' % num for num in range(16)]
+    queries += [
+        b'\033]10;?\033\\',  # Foreground (standard)
+        b'\033]11;?\033\\',  # Background (standard)
+        b'\033]4;-1;?\033\\',  # Foreground (iTerm2 fallback)
+        b'\033]4;-2;?\033\\',  # Background (iTerm2 fallback)
+    ]
+
+    try:
+        response = _query_osc(
+            b''.join(queries),
+            timeout=TIMEOUT_RESPONSE,
+            debug=debug,
+            expected_responses=len(queries),
+        )
+    except TerminalError as e:
+        _debug_print(f'Batched palette query failed: {e}', debug)
+        return {}
+
+    # Demultiplex: every response echoes the query it answers, so one
+    # regex pass over the whole stream routes each color to its number.
+    # The OSC 10/11 answers arrive before the OSC 4;-1/-2 fallbacks,
+    # so setdefault keeps them on conflict.
+    palette: dict[int, str | None] = {}
+    for match in _PALETTE_RE.finditer(response):
+        num_str, osc_code, r_hex, g_hex, b_hex = match.groups()
+        key = int(num_str) if num_str else (-1 if osc_code == b'10' else -2)
+
+        r, g, b = (int(c[:2], 16) for c in (r_hex, g_hex, b_hex))
+        palette.setdefault(key, f'#{r:02x}{g:02x}{b:02x}'.upper())
+
+    _debug_print(f'Batched palette: {palette}', debug)
+
+    # Only cache palettes the terminal actually answered - an empty or
+    # all-None result would just pin a failed query
+    if any(color is not None for color in palette.values()):
+        _save_palette_cache(palette, debug=debug)
+
+    return palette
+
+
+# There are only 18 possible queries (16 ANSI colors plus the special
+# foreground / background colors), so cache them all unconditionally
+@cache
 def get_terminal_ansi_color(
     ansi_color_num: int, debug: bool = DEBUG
 ) -> str | None:
@@ -67,75 +294,70 @@ def _debug_print(msg: str, debug: bool = False) -> None:
         print(msg)
 
 
-def _query_osc_4(color_num: int, debug: bool = False) -> str | None:
-    """Query terminal for ANSI color using OSC 4."""
-    _debug_print(f'\nQuerying OSC 4 color {color_num}', debug)
+def _query_osc_color(query: bytes, debug: bool = False) -> str | None:
+    """
+    Send a single OSC color query and parse the response.
 
+    One shared helper for the OSC 4 / 10 / 11 wrappers so retry,
+    parsing and error handling exist exactly once.
+    """
     try:
-        response = _query_osc_retry(f'\033]4;{color_num};?\007', debug=debug)
+        response = _query_osc_retry(query, debug=debug)
         return _parse_rgb_response(response, debug=debug)
     except TerminalError:
         return None
 
 
+def _query_osc_4(color_num: int, debug: bool = False) -> str | None:
+    """Query terminal for ANSI color using OSC 4."""
+    _debug_print(f'\nQuerying OSC 4 color {color_num}', debug)
+    return _query_osc_color(b'\033]4;%d;?\033\\' % color_num, debug=debug)
+
+
 def _query_osc_10(debug: bool = False) -> str | None:
     """Query terminal for foreground color using OSC 10."""
     _debug_print('\nQuerying OSC 10 (foreground)', debug)
-
-    try:
-        response = _query_osc_retry('\033]10;?\007', debug=debug)
-        return _parse_rgb_response(response, debug=debug)
-    except TerminalError:
-        return None
+    return _query_osc_color(b'\033]10;?\033\\', debug=debug)
 
 
 def _query_osc_11(debug: bool = False) -> str | None:
     """Query terminal for background color using OSC 11."""
     _debug_print('\nQuerying OSC 11 (background)', debug)
-
-    try:
-        response = _query_osc_retry('\033]11;?\007', debug=debug)
-        return _parse_rgb_response(response, debug=debug)
-    except TerminalError:
-        return None
+    return _query_osc_color(b'\033]11;?\033\\', debug=debug)
 
 
-def _parse_rgb_response(response: str, debug: bool = False) -> str | None:
+def _parse_rgb_response(response: bytes, debug: bool = False) -> str | None:
     """Parse RGB color from OSC response."""
     _debug_print(f'Parsing response: {repr(response)}', debug)
 
-    if 'rgb:' not in response:
+    match = _RGB_RE.search(response)
+    if match is None:
         _debug_print('No rgb: in response', debug)
         return None
 
-    try:
-        rgb = response.split('rgb:')[1].split('\007')[0].strip('\033\\')
-        r, g, b = [int(c[:2], 16) for c in rgb.split('/')]
-        result = f'#{r:02x}{g:02x}{b:02x}'.upper()
-        _debug_print(f'Parsed color: {result}', debug)
-        return result
-    except (ValueError, IndexError) as e:
-        _debug_print(f'Error parsing RGB values: {e}', debug)
-        return None
+    r, g, b = (int(c[:2], 16) for c in match.groups())
+    result = f'#{r:02x}{g:02x}{b:02x}'.upper()
+    _debug_print(f'Parsed color: {result}', debug)
+    return result
 
 
 def _query_osc_retry(
-    query: str,
+    query: bytes,
     retries: int = 2,
     timeout: float = TIMEOUT_RESPONSE,
     debug: bool = False,
-) -> str:
+) -> bytes:
     """
     Send an OSC query to the terminal with retries.
 
     Args:
-        query: The full OSC query string (including ESC and terminator)
+        query: The full OSC query bytes (including ESC and terminator)
         retries: Number of times to retry on failure
         timeout: How long to wait for response (seconds)
         debug: Whether to print debug messages
 
     Returns:
-        The complete response string
+        The complete response as raw bytes
 
     Raises:
         TerminalError: If all retries failed
@@ -159,22 +381,30 @@ def _query_osc_retry(
 
 
 def _query_osc(
-    query: str, timeout: float = TIMEOUT_RESPONSE, debug: bool = False
-) -> str:
+    query: bytes,
+    timeout: float = TIMEOUT_RESPONSE,
+    debug: bool = False,
+    expected_responses: int = 1,
+) -> bytes:
     """
-    Send an OSC query to the terminal and return the response.
+    Send one or more OSC queries to the terminal and return the response.
 
     Args:
-        query: The full OSC query string (including ESC and terminator)
+        query: The full OSC query bytes (including ESC and terminator),
+            possibly several queries concatenated
         timeout: How long to wait for response (seconds)
         debug: Whether to print debug messages
+        expected_responses: Number of terminated responses to wait for
 
     Returns:
-        The complete response string
+        The complete response as raw bytes
     """
 
     _debug_print(f'Sending query: {repr(query)}', debug)
 
+    if not _terminal_usable():
+        raise TerminalError('Terminal cannot answer OSC queries')
+
     fd = None
     old_settings = None
 
@@ -186,46 +416,67 @@ def _query_osc(
         raise TerminalError('Failed to get terminal settings') from e
 
     try:
-        _debug_print('Setting terminal to raw mode', debug)
-
-        # Set terminal to raw mode
-        tty.setraw(fd)
+        _debug_print('Setting terminal to cbreak mode', debug)
+
+        # Minimal cbreak-style setup: only canonical mode and echo need
+        # to be off to read the response. tty.setraw would also clobber
+        # signal handling and output processing, which is both more
+        # work to undo and more dangerous if the process dies
+        # mid-query. VMIN=0/VTIME lets the kernel time out reads.
+        new_settings = termios.tcgetattr(fd)
+        new_settings[3] &= ~(termios.ICANON | termios.ECHO)
+        new_settings[6] = list(new_settings[6])
+        new_settings[6][termios.VMIN] = 0
+        new_settings[6][termios.VTIME] = max(1, int(TIMEOUT_READ_CHAR * 10))
+        termios.tcsetattr(fd, termios.TCSANOW, new_settings)
 
         # Clear input buffer
         termios.tcflush(fd, termios.TCIFLUSH)
 
-        # Send query
-        sys.stdout.write(query)
+        # Send query: flush any pending buffered output first, then
+        # write the raw bytes straight to the fd - no text encoding
         sys.stdout.flush()
+        os.write(sys.stdout.fileno(), query)
 
         # Wait for response
         _debug_print(f'Waiting for response (timeout: {timeout}s)', debug)
 
-        rlist, _, _ = select.select([sys.stdin], [], [], timeout)
+        rlist, _, _ = select.select([fd], [], [], timeout)
         if not rlist:
             _debug_print('Timeout waiting for response', debug)
             raise TerminalTimeoutError('Terminal did not respond')
 
-        # Read response until terminator
-        response = ''
-        while True:
-            # Check if we can read without blocking
-            rlist, _, _ = select.select([sys.stdin], [], [], TIMEOUT_READ_CHAR)
+        # Drain the responses in large chunks straight from the fd:
+        # one read() syscall per select wakeup instead of one per byte.
+        # A bytearray accumulates in place, avoiding a fresh bytes
+        # object per appended chunk.
+        response = bytearray()
+        while len(response) < MAX_RESPONSE_LEN:
+            rlist, _, _ = select.select([fd], [], [], TIMEOUT_READ_CHAR)
             if not rlist:
                 _debug_print('No more data available', debug)
                 break
 
-            char = sys.stdin.read(1)
-            if not char:  # EOF
+            chunk = os.read(fd, 4096)
+            if not chunk:  # EOF
                 _debug_print('Got EOF', debug)
                 break
 
-            response += char
-            _debug_print(f'Read character: {repr(char)}', debug)
+            response += chunk
+            _debug_print(f'Read chunk: {repr(chunk)}', debug)
 
-            if char == '\007' or response.endswith('\033\\'):
+            terminators_seen = response.count(b'\007') + response.count(
+                b'\033\\'
+            )
+            if terminators_seen >= expected_responses:
                 _debug_print(f'Got complete response: {repr(response)}', debug)
-                return response
+                return bytes(response)
+
+        if b'\007' in response or b'\033\\' in response:
+            # Partial palette: some terminals skip queries they don't
+            # support, so return what we got
+            _debug_print(f'Got partial response: {repr(response)}', debug)
+            return bytes(response)
 
         _debug_print('Response incomplete', debug)
         raise TerminalError('Incomplete response from terminal')
@@ -1,9 +1,9 @@
 import plistlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from pprint import pformat
 from typing import Literal, TypeAlias, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from .ansi_mapping import AnsiColor, AnsiMapping
 
@@ -11,29 +11,39 @@ from .ansi_mapping import AnsiColor, AnsiMapping
 class TMThemeTokenRuleSettings(BaseModel):
     """Settings for TextMate theme scopes."""
 
+    # Frozen models skip the setattr/validation machinery entirely;
+    # apply_ansi_mapping builds new instances instead of mutating
+    model_config = ConfigDict(frozen=True)
+
     foreground: str | None = None
     background: str | None = None
     font_style: str | None = Field(None, alias='fontStyle')
 
     def __str__(self) -> str:
-        return f'TMThemeSettings({pformat(self.model_dump(), indent=2)})'
+        # model_dump_json serializes in pydantic's Rust core - far
+        # cheaper than model_dump + pformat re-walking the dict
+        return f'TMThemeSettings({self.model_dump_json(indent=2)})'
 
 
 class TMThemeTokenRule(BaseModel):
     """Token rule configuration in TextMate themes."""
 
+    model_config = ConfigDict(frozen=True)
+
     type: Literal['token'] = 'token'
     name: str | None = None
     scope: str | None = None
     settings: TMThemeTokenRuleSettings
 
     def __str__(self) -> str:
-        return f'TMThemeRule({pformat(self.model_dump(), indent=2)})'
+        return f'TMThemeRule({self.model_dump_json(indent=2)})'
 
 
 class TMThemeGlobalSettings(BaseModel):
     """Global settings for TextMate themes."""
 
+    model_config = ConfigDict(frozen=True)
+
     type: Literal['global'] = 'global'
     settings: dict[str, str]
 
@@ -51,6 +61,8 @@ class TMTheme(BaseModel):
     format.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     name: str
     settings: list[TMThemeSettingsItem]
 
@@ -60,77 +72,148 @@ class TMTheme(BaseModel):
         if isinstance(file_path, str):
             file_path = Path(file_path)
 
-        with open(file_path, 'rb') as f:
-            theme_data = plistlib.load(f)
-            return cls.model_validate(theme_data)
+        # Read the whole file in one syscall and parse from memory
+        # instead of letting the XML parser issue many small reads
+        theme_data = plistlib.loads(file_path.read_bytes())
+        return cls.model_validate(theme_data)
+
+    @classmethod
+    def load_many(
+        cls, file_paths: list[Union[str, Path]], max_workers: int = 8
+    ) -> list['TMTheme']:
+        """
+        Load several tmTheme files concurrently.
+
+        Loading is IO-bound (file read plus plist parsing), so threads
+        overlap the disk waits; results come back in input order.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(cls.from_tm_theme, file_paths))
 
     def to_tm_theme(self, file_path: Union[str, Path]) -> None:
         """Save the theme as a TextMate tmTheme plist file."""
         if isinstance(file_path, str):
             file_path = Path(file_path)
 
-        with open(file_path, 'wb') as f:
-            # Exclude None values when dumping to plist
-            data = self.model_dump(by_alias=True, exclude_none=True)
-            plistlib.dump(data, f)
+        # Exclude None values when dumping to plist
+        data = self.model_dump(by_alias=True, exclude_none=True)
+
+        # Serialize to memory first: plistlib emits many small writes,
+        # so buffering them and writing the file in one go avoids a
+        # syscall per element. sort_keys=False is safe only because
+        # every dict reaching this point has a deterministic order -
+        # pydantic field order plus the definition-order global
+        # settings built in converter_vsc_tm
+        file_path.write_bytes(plistlib.dumps(data, sort_keys=False))
+
+    @staticmethod
+    def save_many(
+        pairs: list[tuple['TMTheme', Union[str, Path]]],
+        max_workers: int = 8,
+    ) -> None:
+        """Save several themes concurrently (see `load_many`)."""
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(
+                executor.map(lambda pair: pair[0].to_tm_theme(pair[1]), pairs)
+            )
 
     def __str__(self) -> str:
-        return f'TMTheme({pformat(self.model_dump(), indent=2)})'
+        return f'TMTheme({self.model_dump_json(indent=2)})'
+
+    def __repr__(self) -> str:
+        # Keep repr cheap: a logged theme should not serialize
+        # thousands of rules just to be filtered out
+        return (
+            f'TMTheme(name={self.name!r}, '
+            f'settings=[{len(self.settings)} items])'
+        )
 
     def apply_ansi_mapping(self, mapping: AnsiMapping) -> 'TMTheme':
         """Create a new theme with colors replaced by their ANSI mappings."""
-        # Create new theme
-        ansi_theme = self.model_copy()
-        ansi_color_map = {
-            mapping.color_code: mapping for mapping in mapping.color_mappings
-        }
+        # Flatten the mapping into source hex -> TM hex up front: the
+        # target hex is computed once per mapped color instead of once
+        # per occurrence, and the per-setting work below becomes a
+        # single dict probe
+        src_to_tm: dict[str, str] = {}
+        for color_mapping in mapping.color_mappings:
+            if color_mapping.ansi_color is not None:
+                src_to_tm[color_mapping.color_code] = (
+                    self._convert_ansi_to_tm_hex(color_mapping.ansi_color)
+                )
 
-        first_setting: TMThemeSettingsItem = ansi_theme.settings[0]
-        if isinstance(first_setting, TMThemeGlobalSettings):
-            global_settings: TMThemeGlobalSettings = first_setting
-        else:
+        first_setting: TMThemeSettingsItem = self.settings[0]
+        if not isinstance(first_setting, TMThemeGlobalSettings):
             raise ValueError(
                 'First setting in TMTheme is not a global settings dict'
             )
 
-        # Adjust global settings
+        # Early out: if no color in the theme has a mapping, the only
+        # change is the name - skip the full settings rebuild
+        theme_colors = {
+            color for color in first_setting.settings.values() if color
+        }
+        theme_colors.update(
+            setting.settings.foreground
+            for setting in self.settings[1:]
+            if isinstance(setting, TMThemeTokenRule)
+            and setting.settings.foreground
+        )
+        if not theme_colors & src_to_tm.keys():
+            return self.model_copy(update={'name': f'{self.name} (ANSI)'})
+
         unmapped_colors: list[str] = []
-        for field_name, color in global_settings.settings.items():
-            if not color:
-                continue
-            if color in ansi_color_map:
-                ansi_color = ansi_color_map[color].ansi_color
-                if ansi_color is None:
-                    unmapped_colors.append(color)
-                    continue
-                global_settings.settings[field_name] = (
-                    self._convert_ansi_to_tm_hex(ansi_color)
-                )
-            else:
-                unmapped_colors.append(color)
 
-        # Process remaining settings (token rules)
-        for setting in ansi_theme.settings[1:]:
-            if not isinstance(setting, TMThemeTokenRule):
-                continue
-            if not setting.settings.foreground:
-                continue
-            color = setting.settings.foreground
-            if color in ansi_color_map:
-                ansi_color = ansi_color_map[color].ansi_color
-                if ansi_color is None:
+        # Build new global settings instead of mutating the originals:
+        # model_copy() is shallow, so in-place edits would leak into the
+        # source theme's children. model_construct skips revalidation of
+        # values that already passed validation once.
+        new_global_dict: dict[str, str] = {}
+        for field_name, color in first_setting.settings.items():
+            tm_hex = src_to_tm.get(color) if color else None
+            if tm_hex is not None:
+                new_global_dict[field_name] = tm_hex
+            else:
+                if color:
                     unmapped_colors.append(color)
+                new_global_dict[field_name] = color
+
+        new_settings: list[TMThemeSettingsItem] = [
+            TMThemeGlobalSettings.model_construct(settings=new_global_dict)
+        ]
+
+        # Token rules: untouched rules are shared with the source theme,
+        # only remapped ones get fresh objects
+        for setting in self.settings[1:]:
+            if (
+                isinstance(setting, TMThemeTokenRule)
+                and setting.settings.foreground
+            ):
+                color = setting.settings.foreground
+                tm_hex = src_to_tm.get(color)
+                if tm_hex is not None:
+                    new_settings.append(
+                        TMThemeTokenRule.model_construct(
+                            name=setting.name,
+                            scope=setting.scope,
+                            settings=(
+                                TMThemeTokenRuleSettings.model_construct(
+                                    foreground=tm_hex,
+                                    background=setting.settings.background,
+                                    font_style=setting.settings.font_style,
+                                )
+                            ),
+                        )
+                    )
                     continue
-                setting.settings.foreground = self._convert_ansi_to_tm_hex(
-                    ansi_color
-                )
-            else:
+
                 unmapped_colors.append(color)
 
-        # Update theme name
-        ansi_theme.name = f'{self.name} (ANSI)'
+            new_settings.append(setting)
 
-        return ansi_theme
+        return TMTheme.model_construct(
+            name=f'{self.name} (ANSI)',
+            settings=new_settings,
+        )
 
     def _convert_ansi_to_tm_hex(self, ansi_color: AnsiColor) -> str:
         """
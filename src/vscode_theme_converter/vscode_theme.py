@@ -1,60 +1,91 @@
+import re
+import sys
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Literal
 
-import json5
+import orjson
 from pydantic import BaseModel, Field, field_validator, model_validator
 from typing_extensions import Self
 
 from vscode_theme_converter.conversion_mappings import (
-    VSCODE_TO_TM_SETTINGS_MAP,
+    VSCODE_TO_TM_SETTINGS_KEYS,
 )
 
 from .ansi_mapping import AnsiMapping, ColorMapping
 
+# Compiled VSCode themes are JSONC: JSON plus comments and trailing
+# commas. Stripping those with precompiled regexes lets us parse with
+# orjson instead of a pure-Python JSON5 parser, which would dominate
+# theme load time. Both patterns match string literals first so that
+# comment-like content inside strings (e.g. the vscode:// schema URL)
+# is left untouched.
+_JSONC_COMMENT_RE = re.compile(
+    rb'("(?:\\.|[^"\\])*")|//[^\n]*|/\*.*?\*/', re.DOTALL
+)
+_JSONC_TRAILING_COMMA_RE = re.compile(rb'("(?:\\.|[^"\\])*")|,(\s*[}\]])')
 
-class TokenColorSettings(BaseModel):
-    foreground: str | None = None
-    font_style: str | None = Field(None, alias='fontStyle')
 
+def load_jsonc(json_path: Path) -> Any:
+    """
+    Load a JSON / JSONC file.
 
-class TokenColor(BaseModel):
-    """A syntax highlighting rule."""
+    Compiled VSCode themes only ever use JSONC features (comments and
+    trailing commas), so the preprocessor plus orjson covers every
+    input without a pure-Python JSON5 parser as a fallback.
+    """
+    # Plain .json files don't need the comment-stripping scan at all -
+    # parse them directly and only fall through if they turn out to
+    # contain JSONC syntax anyway
+    if json_path.suffix == '.json':
+        try:
+            return orjson.loads(json_path.read_bytes())
+        except orjson.JSONDecodeError:
+            pass
+
+    # Preprocess on the raw bytes: orjson parses bytes natively, so
+    # decoding to str and re-encoding for the parser would just add
+    # two full copies of the file
+    raw = json_path.read_bytes()
+
+    stripped = _JSONC_COMMENT_RE.sub(lambda m: m.group(1) or b'', raw)
+    stripped = _JSONC_TRAILING_COMMA_RE.sub(
+        lambda m: m.group(1) or m.group(2), stripped
+    )
 
-    name: str | None = None
-    scope: str | None = None
-    settings: TokenColorSettings
+    return orjson.loads(stripped)
 
 
-class Colors(BaseModel):
-    """Expected colors in a VSCode theme."""
+@dataclass(slots=True)
+class TokenColorSettings:
+    """
+    Settings of a syntax highlighting rule.
 
-    class Config:
-        populate_by_name = True
+    Token rules are the hottest objects in a theme (one per rule per
+    theme), so they are plain slotted dataclasses: no per-instance
+    __dict__ and no pydantic alias/validation dispatch per field. The
+    JSON alias mapping happens once in `from_dict`.
+    """
 
-    # Editor colors
-    editor_foreground: str | None = Field(None, alias='editor.foreground')
-    editor_background: str | None = Field(None, alias='editor.background')
-    editor_cursor_foreground: str | None = Field(
-        None, alias='editorCursor.foreground'
-    )
-    editor_selection_background: str | None = Field(
-        None, alias='editor.selectionBackground'
-    )
-    editor_line_highlight_background: str | None = Field(
-        None, alias='editor.lineHighlightBackground'
-    )
-    editor_whitespace_foreground: str | None = Field(
-        None, alias='editorWhitespace.foreground'
-    )
+    foreground: str | None = None
+    font_style: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> 'TokenColorSettings':
+        """Create settings from their JSON dict representation."""
+        return cls(
+            foreground=data.get('foreground'),
+            font_style=data.get('fontStyle'),
+        )
 
-    # Terminal colors
-    terminal_foreground: str | None = Field(None, alias='terminal.foreground')
-    terminal_cursor_foreground: str | None = Field(
-        None, alias='terminalCursor.foreground'
-    )
 
-    # Additional colors
-    other_colors: dict[str, str] = Field(default_factory=dict)
+@dataclass(slots=True)
+class TokenColor:
+    """A syntax highlighting rule."""
+
+    name: str | None = None
+    scope: str | None = None
+    settings: TokenColorSettings = field(default_factory=TokenColorSettings)
 
 
 class VSCodeTheme(BaseModel):
@@ -70,9 +101,9 @@ class VSCodeTheme(BaseModel):
         `Developer: Generate Color Theme From Current Settings`
     """
 
-    class Config:
-        populate_by_name = True
-
+    # Input always comes from VSCode's own JSON, which uses the alias
+    # spellings - without populate_by_name pydantic probes one key per
+    # field instead of trying both the alias and the python name
     json_schema: str | None = Field(None, alias='$schema')
     type: Literal['light', 'dark'] | None = None
     name: str | None = None
@@ -85,18 +116,25 @@ class VSCodeTheme(BaseModel):
     colors: dict[str, str]
     token_colors: list[TokenColor] = Field(alias='tokenColors')
 
-    @model_validator(mode='after')
-    def check_no_includes(self) -> Self:
-        """Ensure this is a compiled theme without includes."""
-        values = self.model_dump()
-        if 'include' in values:
+    @model_validator(mode='before')
+    @classmethod
+    def check_no_includes(cls, data: Any) -> Any:
+        """
+        Ensure this is a compiled theme without includes.
+
+        Runs on the raw input dict: checking one key there is free,
+        while the previous mode='after' variant serialized the entire
+        validated theme with model_dump just to probe for it (and could
+        never trip, since validation strips unknown keys).
+        """
+        if isinstance(data, dict) and 'include' in data:
             raise ValueError(
                 'This converter should be used with compiled theme files that '
                 "don't contain any `include` keys.\n\n"
                 "Use VSCode's `Developer: Generate Color Theme From Current "
                 'Settings` to generate a compiled theme file.'
             )
-        return self
+        return data
 
     @classmethod
     def from_json(cls, json_path: str | Path) -> Self:
@@ -105,8 +143,45 @@ class VSCodeTheme(BaseModel):
         if isinstance(json_path, str):
             json_path = Path(json_path)
 
-        with open(json_path, 'r', encoding='utf-8') as f:
-            theme_data = json5.loads(f.read())
+        theme_data = load_jsonc(json_path)
+
+        theme = cls.model_validate(theme_data)
+
+        if theme.name is None:
+            theme.name = json_path.stem
+
+        return theme
+
+    # Top-level keys needed by the ANSI-mapping workflow; everything
+    # else (notably large semanticTokenColors blocks) is dead weight
+    # for those callers
+    _PARTIAL_FIELDS = frozenset({'name', 'colors', 'tokenColors'})
+
+    @classmethod
+    def from_json_partial(
+        cls,
+        json_path: str | Path,
+        fields: frozenset[str] = _PARTIAL_FIELDS,
+    ) -> Self:
+        """
+        Load a theme, validating only the given top-level keys.
+
+        Callers like `ansi-map gen` only need the name, colors and
+        token rules; dropping the other keys before validation skips
+        pydantic work on blocks such as `semanticTokenColors`, which
+        can be thousands of entries in compiled themes. `include` is
+        always kept so the compiled-theme check still fires.
+        """
+        if isinstance(json_path, str):
+            json_path = Path(json_path)
+
+        theme_data = load_jsonc(json_path)
+        if isinstance(theme_data, dict):
+            theme_data = {
+                key: value
+                for key, value in theme_data.items()
+                if key in fields or key == 'include'
+            }
 
         theme = cls.model_validate(theme_data)
 
@@ -120,39 +195,30 @@ class VSCodeTheme(BaseModel):
 
         color_mapping_dict: dict[str, ColorMapping] = {}
 
-        def add_color_mapping(
-            color: str, scopes: str | list[str] | None
-        ) -> None:
-            if isinstance(scopes, str):
-                scopes = [scopes]
-            elif scopes is None:
-                scopes = []
-
-            # Create or update mapping
-            if color not in color_mapping_dict:
-                mapping = ColorMapping(color_code=color, scopes=set(scopes))
-                color_mapping_dict[color] = mapping
+        def add_color_mapping(color: str, scopes: tuple[str, ...]) -> None:
+            # Create or update the mapping with a single dict probe
+            mapping = color_mapping_dict.get(color)
+            if mapping is None:
+                color_mapping_dict[color] = ColorMapping(
+                    color_code=color, scopes=scopes
+                )
             else:
-                mapping = color_mapping_dict[color]
-                mapping.scopes.update(scopes)
+                mapping.scopes = tuple(sorted({*mapping.scopes, *scopes}))
 
         # Process colors (settings)
-        vsc_to_tm_settings_list = list(VSCODE_TO_TM_SETTINGS_MAP.keys())
         for setting, color_value in self.colors.items():
-            if setting in vsc_to_tm_settings_list:
-                add_color_mapping(
-                    color=color_value,
-                    scopes=setting,
-                )
+            if setting in VSCODE_TO_TM_SETTINGS_KEYS:
+                add_color_mapping(color=color_value, scopes=(setting,))
 
-        # Process token colors
+        # Process token colors (scope is always a single string after
+        # normalization, so the tuple is built right here)
         for token in self.token_colors:
             if not token.settings.foreground:
                 continue
 
             add_color_mapping(
                 color=token.settings.foreground,
-                scopes=token.scope,
+                scopes=(token.scope,) if token.scope else (),
             )
 
         return AnsiMapping(
@@ -179,8 +245,11 @@ class VSCodeTheme(BaseModel):
         1. Splitting list-based scopes into separate rules
         2. Keeping only the last rule for each scope
         """
-        # Track the last rule for each scope
-        scope_map: dict[str, TokenColor] = {}
+        # Track only the winning (name, settings) pair per scope:
+        # overridden rules are discarded before any TokenColor is
+        # allocated, so N raw rules cost N dict writes but only
+        # len(scope_map) constructions
+        scope_map: dict[str, tuple[str | None, TokenColorSettings]] = {}
 
         for token_data in token_colors:
             name = token_data.get('name')
@@ -191,15 +260,25 @@ class VSCodeTheme(BaseModel):
             if scopes is None or settings is None:
                 continue
 
+            # Convert the settings dict once per rule and share the
+            # object across the split scopes - settings are never
+            # mutated after parsing, so a copy per scope is wasted work
+            settings_obj = TokenColorSettings.from_dict(settings)
+
+            # Most rules carry a single scope string; write it directly
+            # instead of wrapping it in a one-element list first.
+            # Scopes are interned on the way in: the same scope string
+            # recurs across rules (and again in the mapping file), so
+            # every later dict probe or set merge on them starts with a
+            # pointer comparison instead of hashing the full string.
             if isinstance(scopes, str):
-                scopes = [scopes]
+                scope_map[sys.intern(scopes)] = (name, settings_obj)
+                continue
 
             for scope in scopes:
-                rule = TokenColor(
-                    name=name,
-                    scope=scope,
-                    settings=settings,
-                )
-                scope_map[scope] = rule
+                scope_map[sys.intern(scope)] = (name, settings_obj)
 
-        return list(scope_map.values())
+        return [
+            TokenColor(name=name, scope=scope, settings=settings_obj)
+            for scope, (name, settings_obj) in scope_map.items()
+        ]